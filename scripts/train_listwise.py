@@ -320,7 +320,7 @@ def run_one_epoch(
     sum_L_sub, cnt_L_sub = 0, 0
 
     for batch in loader:
-        g_batch = batch["enzyme_graph"].to(cfg.device)
+        g_batch = batch["enzyme_graph"].to(cfg.device, non_blocking=True)
         enz_vec = enzyme_backbone(g_batch)      # [B, De]
         z_e_raw = projector.proj_e(enz_vec)     # [B, D]
 
@@ -835,11 +835,12 @@ def main():
         lr=cfg.lr, weight_decay=cfg.weight_decay
     )
 
-    # DataLoader（保持不变）
+    # DataLoader（保持不变；GPU 训练时使用锁页内存，便于异步拷贝）
+    pin = str(cfg.device).startswith("cuda")
     loader_train = DataLoader(ds_train, batch_size=cfg.batch_size, shuffle=True,
-                              collate_fn=collate_pairs, num_workers=0)
+                              collate_fn=collate_pairs, num_workers=0, pin_memory=pin)
     loader_val   = DataLoader(ds_val,   batch_size=cfg.batch_size, shuffle=False,
-                              collate_fn=collate_pairs, num_workers=0)
+                              collate_fn=collate_pairs, num_workers=0, pin_memory=pin)
 
     print(f"[INFO] dataset(listwise) train={len(ds_train)} | val={len(ds_val)} | device={cfg.device}")
     save_run_config_txt(cfg.out_dir, cfg=cfg, extra={"dataset":{
@@ -7,14 +7,44 @@ and both residue-level and graph-level output modes.
 """
 
 from __future__ import annotations
+import contextlib
 import warnings
+import weakref
+from collections import OrderedDict
 from typing import List, Optional, Tuple
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
 from torch_geometric.nn import (
-    GCNConv, GATConv, GATv2Conv, SAGEConv, GINConv, GINEConv, global_mean_pool
+    GATConv, GATv2Conv, SAGEConv, GINConv, GINEConv
 )
+from torch_geometric.nn.conv.gcn_conv import gcn_norm
 from torch_geometric.data import Batch
+from torch_geometric.utils import to_torch_csr_tensor
+from torch_scatter import scatter_add
+
+# Operator ids, resolved once from conv_type so the per-batch path dispatches on ints
+_OP_GCN, _OP_GAT, _OP_GATV2, _OP_SAGE, _OP_GIN, _OP_GINE = range(6)
+_OPS = {"gcn": _OP_GCN, "gat": _OP_GAT, "gatv2": _OP_GATV2, "sage": _OP_SAGE, "gin": _OP_GIN, "gine": _OP_GINE}
+# GAT/GATv2 drop self-loops with a boolean mask (host sync), which CUDA graphs cannot capture
+_CUDA_GRAPH_OPS = (_OP_GCN, _OP_SAGE, _OP_GIN, _OP_GINE)
+
+
+def _maybe_to(t: Optional[torch.Tensor], device: torch.device) -> Optional[torch.Tensor]:
+    """Move a tensor to device only if needed (None passes through).
+
+    Skips the dispatcher round-trip when the tensor already lives on device;
+    copies to CUDA are non-blocking so pinned host tensors transfer asynchronously
+    (copies to CPU stay synchronous, as their result is read right away).
+    """
+    if t is None or t.device == device:
+        return t
+    return t.to(device, non_blocking=device.type == "cuda")
+
+
+def _bucket(n: int) -> int:
+    """Smallest power of two >= n (CUDA graph padding bucket)."""
+    return 1 << max(n - 1, 0).bit_length()
 
 
 def _edge_weight_from_attr(edge_attr: torch.Tensor, mode: str = "auto") -> torch.Tensor:
@@ -22,6 +52,8 @@ def _edge_weight_from_attr(edge_attr: torch.Tensor, mode: str = "auto") -> torch
 
     Converts edge_attr ([E] or [E,D]) to GCN's required edge_weight ([E]).
     Designed to be robust without assuming specific semantic meaning.
+    The "auto" branch performs a single min/max reduction and every multi-column
+    branch works in place on one fresh buffer to keep memory traffic low.
 
     Args:
         edge_attr: Edge attributes tensor of shape [E] or [E, D].
@@ -41,23 +73,86 @@ def _edge_weight_from_attr(edge_attr: torch.Tensor, mode: str = "auto") -> torch
         if edge_attr.size(-1) == 1:
             w = edge_attr.squeeze(-1)
         else:
+            # The inverse modes reuse one fresh buffer (caller's edge_attr is never mutated);
+            # the final clamp stays out of place under autograd, since reciprocal's backward
+            # needs its (unclamped) output
             if mode == "first_inv":
-                col0 = edge_attr[:, 0]
-                w = 1.0 / (col0 + eps)
+                w = edge_attr.select(1, 0).add(eps).reciprocal_()
+                return torch.clamp(w, min=0.0) if w.requires_grad else w.clamp_(min=0.0)
             elif mode == "mean_inv":
-                mean = edge_attr.mean(dim=-1)
-                w = 1.0 / (mean + eps)
+                w = edge_attr.mean(dim=-1).add_(eps).reciprocal_()
+                return torch.clamp(w, min=0.0) if w.requires_grad else w.clamp_(min=0.0)
             else:  # "auto"
                 m = edge_attr.mean(dim=-1)  # [E]
-                m_min, m_max = m.min(), m.max()
-                if (m_max - m_min) > eps:
-                    m_norm = (m - m_min) / (m_max - m_min + eps)
-                    w = 1.0 - m_norm  # Invert: smaller distances → higher weights
-                else:
-                    w = torch.ones_like(m)
+                if edge_attr.requires_grad:
+                    # aminmax, out= and in-place ops don't support autograd: out-of-place path
+                    m_min, m_max = m.min(), m.max()
+                    span = m_max - m_min
+                    if bool(span > eps):
+                        return torch.clamp((m_max - m + eps) / (span + eps), min=0.0)
+                    return torch.ones_like(m)
+                m_min, m_max = torch.aminmax(m)
+                span = m_max - m_min
+                if bool(span > eps):
+                    # 1 - (m - min) / (span + eps), fused: (max - m + eps) / (span + eps)
+                    # Invert: smaller distances → higher weights
+                    w = torch.empty_like(m)
+                    torch.sub(m_max, m, out=w)
+                    w.add_(eps).div_(span + eps)
+                    return w.clamp_(min=0.0)
+                return torch.ones_like(m)
     return torch.clamp(w, min=0.0)
 
 
+class FastGCNLayer(nn.Module):
+    """GCN layer as a dense projection followed by one sparse matmul.
+
+    Computes ``adj_t @ (x W^T) + b`` on a pre-normalized adjacency, which is what
+    ``GCNConv(normalize=False)`` evaluates, without materializing per-edge messages
+    (O(N·D) instead of O(E·D) memory). Parameter names (``lin.weight``, ``bias``)
+    match ``GCNConv`` so existing checkpoints load unchanged.
+
+    Attributes:
+        lin: Bias-free linear projection.
+        bias: Additive bias applied after aggregation.
+    """
+
+    def __init__(self, in_dim: int, out_dim: int):
+        """Initialize FastGCNLayer.
+
+        Args:
+            in_dim: Input feature dimension.
+            out_dim: Output feature dimension.
+        """
+        super().__init__()
+        self.lin = nn.Linear(in_dim, out_dim, bias=False)
+        self.bias = nn.Parameter(torch.empty(out_dim))
+        self.reset_parameters()
+
+    def reset_parameters(self) -> None:
+        """Glorot weights and zero bias (same initialization as GCNConv)."""
+        nn.init.xavier_uniform_(self.lin.weight)
+        nn.init.zeros_(self.bias)
+
+    def forward(self, x: torch.Tensor, adj_t: torch.Tensor) -> torch.Tensor:
+        """Aggregate projected node features over the normalized adjacency.
+
+        Args:
+            x: Node features [N, in_dim].
+            adj_t: Normalized sparse adjacency (transposed) [N, N].
+
+        Returns:
+            Node features [N, out_dim].
+        """
+        h = self.lin(x)
+        if not torch.is_autocast_enabled(x.device.type):
+            return torch.sparse.mm(adj_t, h) + self.bias
+        # Under autocast, SpMM still runs in adj_t's dtype (FP32): low-precision sparse
+        # kernels are not available on every backend, and neighbour sums stay accurate
+        with torch.autocast(x.device.type, enabled=False):
+            return torch.sparse.mm(adj_t, h.to(adj_t.dtype)) + self.bias
+
+
 class GNNBackbone(nn.Module):
     """Universal GNN backbone supporting multiple convolution operators.
 
@@ -75,6 +170,17 @@ class GNNBackbone(nn.Module):
         gine_missing_edge_policy: Policy when GINE needs edge_attr but it's missing.
     """
 
+    # Max number of normalized GCN adjacencies kept for static graphs (LRU)
+    _ADJ_CACHE_SIZE = 4
+    # Max number of captured CUDA graphs (one per padded size bucket, LRU)
+    _CUDA_GRAPH_CACHE_SIZE = 4
+
+    # One-shot warning bits (see _warn_mask)
+    _W_EDGE = 1   # GCN edge_attr→edge_weight conversion failed
+    _W_EDGEV = 2  # edge_v ignored
+    _W_IGN = 4    # edge_attr ignored by an operator without edge features
+    _W_CUDA_GRAPH = 8  # CUDA graph capture failed for an input bucket
+
     def __init__(
         self,
         conv_type: str,
@@ -85,6 +191,10 @@ class GNNBackbone(nn.Module):
         *,
         gcn_edge_mode: str = "auto",
         gine_missing_edge_policy: str = "error",
+        compile_forward: bool = False,
+        compile_dynamic: bool = True,
+        use_cuda_graph: bool = False,
+        autocast_dtype: Optional[torch.dtype] = None,
         **legacy_kwargs,
     ):
         """Initialize GNN backbone.
@@ -101,6 +211,19 @@ class GNNBackbone(nn.Module):
             gine_missing_edge_policy: Policy when conv_type="gine" but edge_attr is missing:
                                     - "error": Raise error
                                     - "zeros": Use zero placeholders (edge_dim=1)
+            compile_forward: If True, wrap the layer stack + readout with ``torch.compile``
+                           once layers are built (eager if compilation is unavailable).
+            compile_dynamic: With compile_forward, compile shape-generic (True) or
+                           shape-specialized kernels per input shape (False).
+            use_cuda_graph: If True, capture the layer stack + readout into a CUDA
+                          graph for inference (eval mode, grad disabled, CUDA inputs)
+                          and replay it. Node, edge and graph counts are padded up to
+                          power-of-two buckets, so batches of similar size share one
+                          graph (up to 4 buckets are kept). GAT/GATv2 cannot be
+                          captured and always run eagerly.
+            autocast_dtype: If set (e.g. ``torch.bfloat16``), run the convolution stack
+                          under ``torch.autocast`` with this dtype. Edge weights,
+                          pooling divisors and the readout stay in FP32.
             **legacy_kwargs: Legacy parameters for backward compatibility.
 
         Raises:
@@ -108,6 +231,9 @@ class GNNBackbone(nn.Module):
         """
         super().__init__()
         self.conv_type = conv_type.lower()
+        if self.conv_type not in _OPS:
+            raise ValueError(f"Unsupported conv_type: {conv_type}")
+        self._op = _OPS[self.conv_type]
 
         # Handle legacy parameter compatibility
         if hidden_dims is None and "dims" in legacy_kwargs:
@@ -126,14 +252,54 @@ class GNNBackbone(nn.Module):
         self.residue_logits = residue_logits
         self.gcn_edge_mode = gcn_edge_mode
         self.gine_missing_edge_policy = gine_missing_edge_policy
+        self.compile_forward = compile_forward
+        self.compile_dynamic = compile_dynamic
+        self.use_cuda_graph = use_cuda_graph
+        self.autocast_dtype = autocast_dtype
 
         # Lazy construction: automatically infer in_dim/edge_dim from first batch
         self._built = False
         self._edge_dim: Optional[int] = None
-
-        # Warning switches: avoid repeated prints for each batch
-        self._warned_edge_ignored = False
-        self._warned_edge_v_ignored = False
+        self._compiled_forward = None
+        self._cuda_graphs: "OrderedDict[tuple, dict]" = OrderedDict()  # captured graphs + static buffers
+        self._zero_batch: Optional[torch.Tensor] = None  # reused all-zeros batch for single graphs
+
+        # Warning switches: avoid repeated prints for each batch (one bit per warning)
+        self._warn_mask = 0
+
+        # GCN adj_t cache for repeated edge_index/edge_attr/edge_weight tensors (static graphs)
+        self._adj_cache: "OrderedDict[tuple, Tuple[tuple, torch.Tensor]]" = OrderedDict()
+
+        # Edge handling policy resolved up-front: one specialized routine per operator
+        self._gine_zeros = gine_missing_edge_policy == "zeros"
+        if self._op == _OP_GCN:
+            self._prep_edges = self._prep_gcn
+        elif self._op == _OP_GINE:
+            self._prep_edges = self._prep_gine
+        else:
+            self._prep_edges = self._prep_edgeless
+
+    def _apply(self, fn, *args, **kwargs):
+        """Drop cached adjacencies, CUDA graphs and buffers when the module is moved/cast."""
+        self._adj_cache.clear()
+        self._cuda_graphs = OrderedDict()
+        self._zero_batch = None
+        return super()._apply(fn, *args, **kwargs)
+
+    def __getstate__(self):
+        """Drop runtime-only caches (weakrefs, CUDA graphs, compiled code) for pickling."""
+        state = self.__dict__.copy()
+        state["_adj_cache"] = OrderedDict()
+        state["_cuda_graphs"] = OrderedDict()
+        state["_compiled_forward"] = None
+        state["_zero_batch"] = None
+        return state
+
+    def __setstate__(self, state):
+        """Restore pickled state and rebuild the compiled forward if it was enabled."""
+        super().__setstate__(state)
+        if self._built:
+            self._setup_compiled_forward()
 
     # ---- layer builders ----
     def _make_conv(self, in_dim: int, out_dim: int, edge_dim: Optional[int]) -> nn.Module:
@@ -150,20 +316,21 @@ class GNNBackbone(nn.Module):
         Raises:
             ValueError: If conv_type is unsupported or GINE requires edge_dim but it's None.
         """
-        ct = self.conv_type
-        if ct == "gcn":
-            return GCNConv(in_dim, out_dim, normalize=True, add_self_loops=True)
-        if ct == "gat":
+        op = self._op
+        if op == _OP_GCN:
+            # Normalization + self-loops are precomputed once per batch (see _prep_gcn)
+            return FastGCNLayer(in_dim, out_dim)
+        if op == _OP_GAT:
             return GATConv(in_dim, out_dim, heads=1, concat=False)
-        if ct == "gatv2":
+        if op == _OP_GATV2:
             return GATv2Conv(in_dim, out_dim, heads=1, concat=False)
-        if ct == "sage":
+        if op == _OP_SAGE:
             return SAGEConv(in_dim, out_dim)
-        if ct == "gin":
+        if op == _OP_GIN:
             return GINConv(nn.Sequential(
                 nn.Linear(in_dim, out_dim), nn.ReLU(), nn.Linear(out_dim, out_dim)
             ))
-        if ct == "gine":
+        if op == _OP_GINE:
             if edge_dim is None:
                 raise ValueError("GINEConv requires 'edge_dim' at layer build time.")
             # GINE's nn operates on nodes (after message aggregation); edge_attr dim passed via edge_dim
@@ -171,7 +338,7 @@ class GNNBackbone(nn.Module):
                 nn.Linear(in_dim, out_dim), nn.ReLU(), nn.Linear(out_dim, out_dim)
             )
             return GINEConv(nn_node, train_eps=True, edge_dim=edge_dim)
-        raise ValueError(f"Unsupported conv_type: {ct}")
+        raise ValueError(f"Unsupported conv_type: {self.conv_type}")
 
     def _build_layers(self, in_dim: int, edge_dim: Optional[int]) -> None:
         """Build all network layers after input dimensions are known.
@@ -183,17 +350,134 @@ class GNNBackbone(nn.Module):
         layers = []
         prev = in_dim
         for d in self.hidden_dims:
-            layers.append(self._make_conv(prev, d, edge_dim if self.conv_type == "gine" else None))
+            layers.append(self._make_conv(prev, d, edge_dim if self._op == _OP_GINE else None))
             prev = d
         self.convs = nn.ModuleList(layers)
-        self.act = nn.ReLU()
-        self.dropout = nn.Dropout(self.dropout_p)
-        # Readout: concatenate all layer outputs then linear projection
+        # Dropout is applied functionally and skipped entirely when p == 0 or in eval
+        self._apply_dropout = self.dropout_p > 0.0
+        # Readout: linear projection over the concatenation of all layer outputs.
+        # Column ranges of readout.weight per layer let _forward_core apply it without the concat.
         self.readout = nn.Linear(sum(self.hidden_dims), self.out_dim)
+        self._readout_slices: List[Tuple[int, int]] = []
+        off = 0
+        for d in self.hidden_dims:
+            self._readout_slices.append((off, off + d))
+            off += d
         self._edge_dim = edge_dim
         self._built = True
 
+        # Optional: compile the layer stack + readout now that shapes of weights are fixed
+        self._setup_compiled_forward()
+
+    def _setup_compiled_forward(self) -> None:
+        """Wrap ``_forward_core`` with ``torch.compile`` if compile_forward is set."""
+        self._compiled_forward = None
+        if self.compile_forward:
+            if hasattr(torch, "compile"):
+                try:
+                    # compile_dynamic=True: one shape-generic graph. False: Dynamo guards
+                    # on input shapes and recompiles per new (N, E, D) until the
+                    # cache_size_limit is reached, after which new shapes run eagerly
+                    self._compiled_forward = torch.compile(
+                        self._forward_core, dynamic=self.compile_dynamic, mode="reduce-overhead"
+                    )
+                except Exception as e:
+                    warnings.warn(f"[GNNBackbone] torch.compile failed ({e}); using eager forward.")
+            else:
+                warnings.warn("[GNNBackbone] torch.compile unavailable; using eager forward.")
+
     # ---- input prep ----
+    def _edge_weight(self, edge_attr: torch.Tensor) -> Optional[torch.Tensor]:
+        """Convert edge_attr to a floating-point edge_weight (None if conversion fails).
+
+        Args:
+            edge_attr: Edge attributes tensor of shape [E] or [E, D].
+
+        Returns:
+            Edge weights tensor of shape [E], or None to fall back to binary adjacency.
+        """
+        try:
+            ew = _edge_weight_from_attr(edge_attr, mode=self.gcn_edge_mode)
+        except Exception:
+            if not self._warn_mask & self._W_EDGE:
+                warnings.warn(
+                    "[GNNBackbone][GCN] edge_attr→edge_weight conversion failed, falling back to binary adjacency."
+                )
+                self._warn_mask |= self._W_EDGE
+            return None
+        return ew if torch.is_floating_point(ew) else ew.float()
+
+    def _cached_adj_t(
+        self,
+        x: torch.Tensor,
+        edge_index: torch.Tensor,
+        edge_attr: Optional[torch.Tensor],
+        edge_weight: Optional[torch.Tensor],
+    ) -> torch.Tensor:
+        """Build GCN's normalized adj_t, reusing results for unchanged edge tensors.
+
+        Entries are keyed by storage pointer, shape and version counter of edge_index,
+        edge_attr and edge_weight, and hold weak references to them: a freed-and-
+        reallocated buffer never produces a stale hit, and an entry is dropped as soon
+        as one of its source tensors is freed. Only hits when the same tensors are
+        passed again (e.g. repeated inference on one graph), not across re-collated
+        batches. Grad-requiring and inference tensors bypass the cache (the latter
+        have no version counter to key on).
+
+        Args:
+            x: Node features [N, D] (size and dtype of adj_t).
+            edge_index: Edge connectivity [2, E].
+            edge_attr: Edge attributes [E] or [E, D], or None.
+            edge_weight: Edge weights [E], or None (then derived from edge_attr).
+
+        Returns:
+            Normalized sparse adjacency (transposed, CSR) [N, N].
+        """
+        srcs = (edge_index, edge_attr, edge_weight)
+        if any(t is not None and (t.requires_grad or t.is_inference()) for t in srcs):
+            return self._build_adj_t(x, *srcs)
+
+        key = (x.size(0), x.dtype, torch.is_inference_mode_enabled(), self.gcn_edge_mode) + tuple(
+            None if t is None else (t.device, t.data_ptr(), tuple(t.shape), t._version) for t in srcs
+        )
+        cache = self._adj_cache
+        hit = cache.get(key)
+        if hit is not None and all(
+            (t is None) if r is None else (r() is t) for r, t in zip(hit[0], srcs)
+        ):
+            cache.move_to_end(key)
+            return hit[1]
+
+        adj_t = self._build_adj_t(x, *srcs)
+
+        def _evict(ref: weakref.ref) -> None:
+            entry = cache.get(key)
+            if entry is not None and any(r is ref for r in entry[0]):
+                del cache[key]
+
+        cache[key] = (tuple(None if t is None else weakref.ref(t, _evict) for t in srcs), adj_t)
+        while len(cache) > self._ADJ_CACHE_SIZE:
+            cache.popitem(last=False)
+        return adj_t
+
+    def _build_adj_t(
+        self,
+        x: torch.Tensor,
+        edge_index: torch.Tensor,
+        edge_attr: Optional[torch.Tensor],
+        edge_weight: Optional[torch.Tensor],
+    ) -> torch.Tensor:
+        """Derive edge_weight from edge_attr if needed and build the normalized adj_t."""
+        if edge_weight is None and edge_attr is not None:
+            edge_weight = self._edge_weight(edge_attr)
+
+        # Normalize once per batch: adj_t = D^-1/2 (A + I) D^-1/2 (transposed, CSR),
+        # identical to GCNConv(normalize=True) but computed once for all layers
+        N = x.size(0)
+        ei_norm, w_norm = gcn_norm(edge_index, edge_weight, N, add_self_loops=True, dtype=x.dtype)
+        # SpMM does no type promotion: match x (GCNConv promoted edge_weight implicitly)
+        return to_torch_csr_tensor(ei_norm.flip(0), w_norm.to(x.dtype), size=(N, N))
+
     def _prepare_inputs(
         self, data: Batch
     ) -> Tuple[torch.Tensor, torch.Tensor, Optional[torch.Tensor], Optional[torch.Tensor], Optional[torch.Tensor]]:
@@ -208,7 +492,8 @@ class GNNBackbone(nn.Module):
         Returns:
             Tuple containing:
                 - x: Node features
-                - edge_index: Edge connectivity
+                - edge_index: Edge connectivity (for GCN: normalized sparse adjacency
+                  ``adj_t`` of shape [N, N], shared by all layers)
                 - edge_attr: Edge attributes (may be None or modified)
                 - edge_weight: Edge weights (may be None or computed from edge_attr)
                 - batch: Batch assignment vector
@@ -216,62 +501,74 @@ class GNNBackbone(nn.Module):
         x = data.x
         device = x.device
 
-        edge_index = data.edge_index.to(device)
-        edge_attr = getattr(data, "edge_attr", None)
-        edge_weight = getattr(data, "edge_weight", None)
-        edge_v = getattr(data, "edge_v", None)
-
-        if edge_attr is not None:
-            edge_attr = edge_attr.to(device)
-        if edge_weight is not None:
-            edge_weight = edge_weight.to(device)
+        edge_index = _maybe_to(data.edge_index, device)
+        edge_attr = _maybe_to(getattr(data, "edge_attr", None), device)
+        edge_weight = _maybe_to(getattr(data, "edge_weight", None), device)
 
         # Warn once: pure GNN doesn't use vector edges
-        if edge_v is not None and not self._warned_edge_v_ignored:
+        if not self._warn_mask & self._W_EDGEV and getattr(data, "edge_v", None) is not None:
             warnings.warn("[GNNBackbone] 'edge_v' detected but ignored by non-GVP backbones.")
-            self._warned_edge_v_ignored = True
+            self._warn_mask |= self._W_EDGEV
 
-        ct = self.conv_type
-
-        # GCN: Try to convert edge_attr to edge_weight
-        if ct == "gcn":
-            if edge_weight is None and edge_attr is not None:
-                try:
-                    ew = _edge_weight_from_attr(edge_attr, mode=self.gcn_edge_mode).to(device)
-                    if not torch.is_floating_point(ew):
-                        ew = ew.float()
-                    edge_weight = ew
-                except Exception:
-                    if not self._warned_edge_ignored:
-                        warnings.warn(
-                            "[GNNBackbone][GCN] edge_attr→edge_weight conversion failed, falling back to binary adjacency."
-                        )
-                        self._warned_edge_ignored = True
-                    edge_weight = None
-
-        # Operators that don't support edge features: ignore edge_attr
-        if ct in {"gat", "gatv2", "sage", "gin"}:
-            if edge_attr is not None and not self._warned_edge_ignored:
-                warnings.warn(f"[GNNBackbone][{ct.upper()}] edge_attr provided but will be ignored.")
-                self._warned_edge_ignored = True
-            edge_attr = None
-
-        # GINE: Must have edge_attr (or zeros policy)
-        if ct == "gine":
-            if edge_attr is None and self.gine_missing_edge_policy != "zeros":
-                raise ValueError(
-                    "[GNNBackbone][GINE] edge_attr required; or set gine_missing_edge_policy='zeros'."
-                )
+        # Operator-specific edge handling (selected once in __init__)
+        edge_index, edge_attr, edge_weight = self._prep_edges(x, edge_index, edge_attr, edge_weight)
 
-        # Batch assignment (default to all zeros if not present)
+        # Batch assignment (default to all zeros if not present; the zeros buffer is
+        # cached and only grows, so single-graph inference does not allocate per call)
         batch = getattr(data, "batch", None)
         if batch is None:
-            batch = torch.zeros(x.size(0), dtype=torch.long, device=device)
+            N = x.size(0)
+            zb = self._zero_batch
+            # Inference-mode tensors cannot be saved for backward: never reuse one in grad mode
+            if (zb is None or zb.numel() < N or zb.device != device
+                    or zb.is_inference() != torch.is_inference_mode_enabled()):
+                zb = self._zero_batch = torch.zeros(N, dtype=torch.long, device=device)
+            batch = zb[:N]
         else:
-            batch = batch.to(device)
+            batch = _maybe_to(batch, device)
 
         return x, edge_index, edge_attr, edge_weight, batch
 
+    def _prep_gcn(
+        self,
+        x: torch.Tensor,
+        edge_index: torch.Tensor,
+        edge_attr: Optional[torch.Tensor],
+        edge_weight: Optional[torch.Tensor],
+    ) -> Tuple[torch.Tensor, Optional[torch.Tensor], Optional[torch.Tensor]]:
+        """GCN: build (or reuse) the normalized adj_t shared by all layers."""
+        adj_t = self._cached_adj_t(x, edge_index, edge_attr, edge_weight)
+        return adj_t, edge_attr, None
+
+    def _prep_edgeless(
+        self,
+        x: torch.Tensor,
+        edge_index: torch.Tensor,
+        edge_attr: Optional[torch.Tensor],
+        edge_weight: Optional[torch.Tensor],
+    ) -> Tuple[torch.Tensor, Optional[torch.Tensor], Optional[torch.Tensor]]:
+        """GAT/GATv2/SAGE/GIN: operators without edge features ignore edge_attr."""
+        if edge_attr is not None and not self._warn_mask & self._W_IGN:
+            warnings.warn(f"[GNNBackbone][{self.conv_type.upper()}] edge_attr provided but will be ignored.")
+            self._warn_mask |= self._W_IGN
+        return edge_index, None, edge_weight
+
+    def _prep_gine(
+        self,
+        x: torch.Tensor,
+        edge_index: torch.Tensor,
+        edge_attr: Optional[torch.Tensor],
+        edge_weight: Optional[torch.Tensor],
+    ) -> Tuple[torch.Tensor, Optional[torch.Tensor], Optional[torch.Tensor]]:
+        """GINE: require edge_attr, or build [E, edge_dim] zeros under the zeros policy."""
+        if edge_attr is None:
+            if not self._gine_zeros:
+                raise ValueError(
+                    "[GNNBackbone][GINE] edge_attr required; or set gine_missing_edge_policy='zeros'."
+                )
+            edge_attr = torch.zeros(edge_index.size(1), self._edge_dim or 1, device=x.device)
+        return edge_index, edge_attr, edge_weight
+
     # ---- forward ----
     def forward(self, data: Batch) -> torch.Tensor:
         """Forward pass through the GNN backbone.
@@ -297,42 +594,236 @@ class GNNBackbone(nn.Module):
         if not self._built:
             in_dim = x.size(-1)
             edge_dim = None
-            if self.conv_type == "gine":
-                if edge_attr is not None:
-                    edge_dim = edge_attr.size(-1) if edge_attr.dim() == 2 else 1
-                elif self.gine_missing_edge_policy == "zeros":
-                    edge_dim = 1  # Use 1D placeholder
-                else:
+            if self._op == _OP_GINE:
+                # _prep_gine guarantees edge_attr (zeros placeholder [E, 1] if missing)
+                if edge_attr is None:
                     raise RuntimeError("[GNNBackbone][GINE] Cannot infer edge_dim.")
+                edge_dim = edge_attr.size(-1) if edge_attr.dim() == 2 else 1
             self._build_layers(in_dim, edge_dim)
             self.to(x.device)
 
-        # If GINE lacks edge_attr and zeros policy selected, construct [E, edge_dim] zeros
-        if self.conv_type == "gine" and edge_attr is None and self.gine_missing_edge_policy == "zeros":
-            E = edge_index.size(1)
-            edge_attr = torch.zeros(E, self._edge_dim or 1, device=x.device)
+        # Per-graph node counts for mean pooling: computed once per batch (host sync
+        # for B happens here) and shared by every layer's pooling inside the core
+        counts = None
+        if not self.residue_logits:
+            num_graphs = int(batch.max()) + 1 if batch.numel() > 0 else 1
+            counts = torch.bincount(batch, minlength=num_graphs).clamp_min(1).unsqueeze(-1)
+            counts = counts.to(self.readout.weight.dtype)  # readout dtype (FP32 under autocast)
+
+        inputs = (x, edge_index, edge_attr, edge_weight, batch, counts)
+        if (self.use_cuda_graph and self._op in _CUDA_GRAPH_OPS and x.is_cuda
+                and not self.training and not torch.is_grad_enabled()):
+            out = self._cuda_graph_forward(inputs)
+            if out is not None:
+                return out
+
+        if self._compiled_forward is not None:
+            out = self._compiled_forward(*inputs)
+            # reduce-overhead replays CUDA graphs whose outputs are overwritten next call
+            return out.clone() if x.is_cuda else out
+        return self._forward_core(*inputs)
+
+    def _pad_inputs(
+        self,
+        inputs: Tuple[Optional[torch.Tensor], ...],
+        static: Optional[Tuple[Optional[torch.Tensor], ...]] = None,
+    ) -> Tuple[Optional[torch.Tensor], ...]:
+        """Copy prepared inputs into buffers padded to the size buckets of ``_bucket``.
 
-        # GNN layer stack
-        outs = []
-        h = x
-        for conv in self.convs:
-            if isinstance(conv, GCNConv):
-                h = conv(h, edge_index, edge_weight=edge_weight)
-            elif isinstance(conv, GINEConv):
-                h = conv(h, edge_index, edge_attr)
+        Padding nodes have zero features and belong to one extra padding graph; padding
+        edges (zero weight for GCN) connect the last padding node to itself, so real
+        rows of the output are unchanged. Slice the first N (residue-level) or B
+        (graph-level) rows of ``_forward_core``'s output to drop the padding.
+
+        Args:
+            inputs: Prepared (x, edge_index, edge_attr, edge_weight, batch, counts).
+            static: Buffers from an earlier call with the same bucket key to fill in
+                place; allocated when None.
+
+        Returns:
+            Padded (x, edge_index, edge_attr, None, batch, counts) for ``_forward_core``.
+        """
+        x, edge_index, edge_attr, _, batch, counts = inputs
+        gcn = self._op == _OP_GCN
+        N = x.size(0)
+        E = edge_index.values().numel() if gcn else edge_index.size(1)
+        B = counts.size(0) if counts is not None else 0
+        Np, Ep, Bp = _bucket(N + 1), _bucket(E), _bucket(B + 1)
+        if self._op != _OP_GINE:
+            edge_attr = None  # only GINE reads edge_attr in the core
+
+        if static is None:
+            x_s = x.new_empty(Np, x.size(1))
+            ea_s = None if edge_attr is None else edge_attr.new_empty(Ep, *edge_attr.shape[1:])
+            batch_s = batch.new_empty(Np)
+            counts_s = None if counts is None else counts.new_empty(Bp, 1)
+            if gcn:
+                crow = edge_index.crow_indices()
+                parts = (
+                    crow.new_empty(Np + 1), edge_index.col_indices().new_empty(Ep), edge_index.values().new_empty(Ep)
+                )
             else:
-                h = conv(h, edge_index)
-            h = self.act(h)
-            h = self.dropout(h)
-            outs.append(h)
+                ei_s = edge_index.new_empty(2, Ep)
+        else:
+            x_s, ei_s, ea_s, _, batch_s, counts_s = static
+            if gcn:
+                parts = (ei_s.crow_indices(), ei_s.col_indices(), ei_s.values())
+
+        x_s[:N].copy_(x)
+        x_s[N:].zero_()
+        if gcn:
+            # Rows N..Np-2 are empty; the last row holds the zero-valued padding entries
+            crow_s, col_s, val_s = parts
+            crow_s[:N + 1].copy_(edge_index.crow_indices())
+            crow_s[N + 1:].fill_(E)
+            crow_s[-1:].fill_(Ep)
+            col_s[:E].copy_(edge_index.col_indices())
+            col_s[E:].fill_(Np - 1)
+            val_s[:E].copy_(edge_index.values())
+            val_s[E:].zero_()
+            if static is None:
+                ei_s = torch.sparse_csr_tensor(crow_s, col_s, val_s, size=(Np, Np))
+        else:
+            ei_s[:, :E].copy_(edge_index)
+            ei_s[:, E:].fill_(Np - 1)
+        if ea_s is not None:
+            ea_s[:E].copy_(edge_attr)
+            ea_s[E:].zero_()
+        batch_s[:N].copy_(batch)
+        batch_s[N:].fill_(Bp - 1)
+        if counts_s is not None:
+            counts_s[:B].copy_(counts)
+            counts_s[B:].fill_(1)
+        return x_s, ei_s, ea_s, None, batch_s, counts_s
+
+    def _cuda_graph_forward(self, inputs: Tuple[Optional[torch.Tensor], ...]) -> Optional[torch.Tensor]:
+        """Run the eager core through a captured CUDA graph, capturing it if needed.
+
+        Inputs are copied into static buffers padded to power-of-two size buckets (see
+        ``_pad_inputs``) and the graph is replayed, replacing the per-layer kernel
+        launches with a single launch. One graph is captured per bucket, feature
+        dims/dtypes, autocast state (own and caller's) and output mode; the least
+        recently used graph is dropped beyond ``_CUDA_GRAPH_CACHE_SIZE``. If capture
+        fails, that key is remembered and runs eagerly.
 
-        # Concatenate all layer outputs (residue dimension unchanged)
-        h_cat = torch.cat(outs, dim=-1)  # [N, sum(hidden_dims)]
+        Args:
+            inputs: Prepared (x, edge_index, edge_attr, edge_weight, batch, counts).
 
-        # Residue-level output: no pooling
-        if self.residue_logits:
-            return self.readout(h_cat)  # [N, out_dim]
+        Returns:
+            Output of ``_forward_core`` (a fresh tensor, safe to keep across calls),
+            or None if this key could not be captured.
+        """
+        x, edge_index, edge_attr, _, batch, counts = inputs
+        gcn = self._op == _OP_GCN
+        E = edge_index.values().numel() if gcn else edge_index.size(1)
+        rows = x.size(0) if self.residue_logits else counts.size(0)
+        edge_dtypes = (
+            (edge_index.crow_indices().dtype, edge_index.values().dtype) if gcn else (edge_index.dtype,)
+        )
+        ea_key = (
+            (tuple(edge_attr.shape[1:]), edge_attr.dtype) if self._op == _OP_GINE and edge_attr is not None else None
+        )
+        # Config read inside the captured region (incl. a caller's autocast, which
+        # FastGCNLayer branches on) is part of the key, so changing it after capture
+        # never replays a stale graph
+        key = (
+            self.autocast_dtype, torch.is_autocast_enabled("cuda"), torch.get_autocast_dtype("cuda"),
+            self.residue_logits, self._apply_dropout,
+            _bucket(x.size(0) + 1), _bucket(E), _bucket(rows + 1) if counts is not None else 0,
+            x.size(1), x.dtype, batch.dtype, edge_dtypes, ea_key,
+            None if counts is None else counts.dtype,
+        )
+
+        state = self._cuda_graphs.get(key)
+        if state is None:
+            static = self._pad_inputs(inputs)
+            state = {"graph": None}
+
+            # Warm up on a side stream before capture (as recommended for CUDA graphs)
+            stream = torch.cuda.Stream()
+            stream.wait_stream(torch.cuda.current_stream())
+            with torch.cuda.stream(stream):
+                for _ in range(3):
+                    self._forward_core(*static)
+            torch.cuda.current_stream().wait_stream(stream)
+
+            # Warm-up errors propagate (eager would fail too); only capture itself may
+            # fail, e.g. on a kernel that syncs with the host
+            graph = torch.cuda.CUDAGraph()
+            try:
+                with torch.cuda.graph(graph):
+                    out = self._forward_core(*static)
+                state = {"graph": graph, "inputs": static, "output": out}
+            except RuntimeError as e:
+                if not self._warn_mask & self._W_CUDA_GRAPH:
+                    warnings.warn(f"[GNNBackbone] CUDA graph capture failed ({e}); using regular forward.")
+                    self._warn_mask |= self._W_CUDA_GRAPH
+            self._cuda_graphs[key] = state
+            while len(self._cuda_graphs) > self._CUDA_GRAPH_CACHE_SIZE:
+                self._cuda_graphs.popitem(last=False)
+            if state["graph"] is None:
+                return None
+        else:
+            self._cuda_graphs.move_to_end(key)
+            if state["graph"] is None:
+                return None
+            self._pad_inputs(inputs, state["inputs"])
+
+        state["graph"].replay()
+        return state["output"][:rows].clone()
+
+    def _forward_core(
+        self,
+        x: torch.Tensor,
+        edge_index: torch.Tensor,
+        edge_attr: Optional[torch.Tensor],
+        edge_weight: Optional[torch.Tensor],
+        batch: torch.Tensor,
+        counts: Optional[torch.Tensor],
+    ) -> torch.Tensor:
+        """Apply the convolution stack and readout to prepared inputs.
+
+        Kept free of lazy-build, input-policy logic and host syncs so it can be
+        compiled or captured into a CUDA graph.
 
-        # Graph-level output: pooling then linear
-        g = global_mean_pool(h_cat, batch)  # [B, sum(hidden_dims)]
-        return self.readout(g)  # [B, out_dim]
\ No newline at end of file
+        Args:
+            x: Node features [N, in_dim].
+            edge_index: Edge connectivity [2, E] (GCN: normalized sparse adj_t [N, N]).
+            edge_attr: Edge attributes (GINE only, otherwise ignored).
+            edge_weight: Edge weights (unused; GCN weights are folded into adj_t).
+            batch: Batch assignment vector [N].
+            counts: Node count per graph [B, 1] (graph-level output only).
+
+        Returns:
+            Residue-level [N, out_dim] or graph-level [B, out_dim] output.
+        """
+        # Per-op conv arguments, selected once for the whole stack (all layers share
+        # one operator): GINE takes edge_attr, GCN's edge_index is the normalized adj_t
+        conv_args = (edge_index, edge_attr) if self._op == _OP_GINE else (edge_index,)
+
+        # Readout accumulator, allocated once: out = bias + sum_i f_i @ W_i^T, where W_i is
+        # layer i's column block of readout.weight (== readout(cat(f_i))) and f_i is the
+        # layer output (residue-level) or its per-graph mean (graph-level, B rows)
+        rows = x.size(0) if self.residue_logits else counts.size(0)
+        weight = self.readout.weight
+        y = self.readout.bias.expand(rows, -1).clone()
+
+        # GNN layer stack (optionally in reduced precision); each layer output is folded
+        # into y right away, so no per-layer list or concat buffer is kept
+        # (autocast_dtype=None leaves any caller-side autocast in effect)
+        h = x
+        amp = (
+            contextlib.nullcontext() if self.autocast_dtype is None
+            else torch.autocast(x.device.type, dtype=self.autocast_dtype)
+        )
+        with amp:
+            for conv, (lo, hi) in zip(self.convs, self._readout_slices):
+                # conv output is a fresh tensor, safe to overwrite in place
+                h = F.relu(conv(h, *conv_args), inplace=True)
+                if self._apply_dropout and self.training:
+                    h = F.dropout(h, self.dropout_p, training=True)
+                f = h.to(y.dtype)  # no-op cast unless autocast is on
+                if not self.residue_logits:
+                    f = scatter_add(f, batch, dim=0, dim_size=rows).div_(counts)
+                y.addmm_(f, weight[:, lo:hi].t())
+        return y  # [N, out_dim] or [B, out_dim]
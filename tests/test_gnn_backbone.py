@@ -0,0 +1,419 @@
+"""Tests for the GNN backbone (src/plaszyme/models/gnn/backbone.py)."""
+
+import io
+import pickle
+import warnings
+
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("torch_geometric")
+pytest.importorskip("torch_scatter")
+
+from torch_geometric.data import Data  # noqa: E402
+
+from src.plaszyme.models.gnn.backbone import GNNBackbone  # noqa: E402
+
+
+def _graph(n: int = 12, e: int = 40, d: int = 3) -> Data:
+    torch.manual_seed(0)
+    return Data(x=torch.randn(n, 8), edge_index=torch.randint(0, n, (2, e)), edge_attr=torch.rand(e, d))
+
+
+def test_pickle_round_trip_after_cached_forward():
+    """Runtime caches (weakref'd edge weights etc.) must not break pickling."""
+    data = _graph()
+    model = GNNBackbone("gcn", [16, 16], out_dim=4).eval()
+    model(data)
+    model(data)  # second call populates the edge_weight cache
+    assert len(model._adj_cache) == 1
+
+    restored = pickle.loads(pickle.dumps(model))
+    assert len(restored._adj_cache) == 0
+    assert torch.allclose(restored(data), model(data))
+
+    buf = io.BytesIO()
+    torch.save(model, buf)
+    buf.seek(0)
+    loaded = torch.load(buf, weights_only=False)
+    assert torch.allclose(loaded(data), model(data))
+
+
+def test_compile_forward_matches_eager_on_cpu():
+    """compile_forward on CPU inputs runs the compiled core and matches eager."""
+    torch._dynamo.reset()
+    data = _graph()
+    eager = GNNBackbone("sage", [16, 16], out_dim=4)
+    eager(data)
+    eager.eval()
+    compiled = GNNBackbone("sage", [16, 16], out_dim=4, compile_forward=True)
+    compiled(data)
+    compiled.load_state_dict(eager.state_dict())
+    compiled.eval()
+    with torch.no_grad():
+        assert torch.allclose(compiled(data), eager(data), atol=1e-5)
+
+
+def test_zero_batch_cache_survives_inference_mode():
+    """A default batch cached under inference_mode must not leak into training."""
+    data = Data(x=torch.randn(10, 8), edge_index=torch.randint(0, 10, (2, 30)))
+    model = GNNBackbone("gcn", [16], out_dim=2)
+    model(data)
+    with torch.inference_mode():
+        model(data)
+    model.train()
+    model(data).sum().backward()
+
+
+def test_gcn_edge_attr_under_inference_mode():
+    """Inference tensors (no version counter) must still yield weighted GCN edges."""
+    data = _graph()
+    model = GNNBackbone("gcn", [16, 16], out_dim=4).eval()
+    with torch.no_grad():
+        expected = model(data)
+    with torch.inference_mode():
+        inf_data = Data(x=data.x.clone(), edge_index=data.edge_index.clone(), edge_attr=data.edge_attr.clone())
+        assert inf_data.edge_attr.is_inference()
+        with warnings.catch_warnings():
+            warnings.filterwarnings("error", message=r".*conversion failed")
+            out = model(inf_data)
+            out_again = model(inf_data)
+    assert torch.allclose(out, expected, atol=1e-6)
+    assert torch.allclose(out_again, expected, atol=1e-6)
+
+
+@pytest.mark.parametrize("residue_logits", [False, True])
+def test_double_precision_model(residue_logits):
+    """model.double() without autocast keeps pooling/readout in the model dtype."""
+    data = _graph()
+    model = GNNBackbone("sage", [16, 16], out_dim=4, residue_logits=residue_logits)
+    model(data)
+    model.double()
+    out = model(Data(x=data.x.double(), edge_index=data.edge_index))
+    assert out.dtype == torch.float64
+
+
+def _gcn_reference_graph() -> Data:
+    """Graph with duplicate edges, existing self-loops and weighted multi-column edge_attr."""
+    torch.manual_seed(1)
+    n = 10
+    ei = torch.randint(0, n, (2, 30))
+    ei = torch.cat([ei, ei[:, :5], torch.tensor([[0, 3, 7], [0, 3, 7]])], dim=1)  # duplicates + self-loops
+    return Data(x=torch.randn(n, 8), edge_index=ei, edge_attr=torch.rand(ei.size(1), 3))
+
+
+def test_fast_gcn_layer_matches_gcnconv():
+    """FastGCNLayer on the precomputed adj_t matches GCNConv(normalize, self-loops), incl. gradients."""
+    from torch_geometric.nn import GCNConv
+    from src.plaszyme.models.gnn.backbone import _edge_weight_from_attr
+
+    data = _gcn_reference_graph()
+    model = GNNBackbone("gcn", [16], out_dim=4, residue_logits=True)
+    model(data)
+    ref = GCNConv(8, 16, normalize=True, add_self_loops=True)
+    ref.load_state_dict(model.convs[0].state_dict())
+
+    x_ref = data.x.clone().requires_grad_()
+    ea_ref = data.edge_attr.clone().requires_grad_()
+    ew = _edge_weight_from_attr(ea_ref, mode=model.gcn_edge_mode)
+    expected = ref(x_ref, data.edge_index, ew)
+
+    x = data.x.clone().requires_grad_()
+    ea = data.edge_attr.clone().requires_grad_()
+    adj_t, _, _ = model._prep_gcn(x, data.edge_index, ea, None)
+    out = model.convs[0](x, adj_t)
+    assert torch.allclose(out, expected, atol=1e-5)
+
+    grad = torch.randn_like(out)
+    expected.backward(grad)
+    out.backward(grad)
+    assert torch.allclose(x.grad, x_ref.grad, atol=1e-5)
+    assert torch.allclose(ea.grad, ea_ref.grad, atol=1e-5)
+    for p, p_ref in zip(model.convs[0].parameters(), ref.parameters()):
+        assert torch.allclose(p.grad, p_ref.grad, atol=1e-5)
+
+
+def test_gcn_float64_edge_weight_with_float32_x():
+    """A float64 edge_weight is cast to x's dtype before the sparse matmul."""
+    data = _graph()
+    data.edge_weight = torch.rand(data.edge_index.size(1), dtype=torch.float64)
+    model = GNNBackbone("gcn", [16], out_dim=4)
+    assert model(data).dtype == torch.float32
+
+
+def _reference_readout(model: GNNBackbone, data: Data) -> torch.Tensor:
+    """Original forward: readout over cat(layer outputs), mean-pooled first for graph-level."""
+    from torch_geometric.nn import global_mean_pool
+
+    h, outs = data.x, []
+    for conv in model.convs:
+        h = torch.relu(conv(h, data.edge_index))
+        outs.append(h)
+    h_cat = torch.cat(outs, dim=-1)
+    if model.residue_logits:
+        return model.readout(h_cat)
+    return model.readout(global_mean_pool(h_cat, data.batch))
+
+
+@pytest.mark.parametrize("residue_logits", [False, True])
+def test_layerwise_readout_matches_concat_readout(residue_logits):
+    """Per-layer readout accumulation equals readout(cat(outs)) (and its gradients)."""
+    torch.manual_seed(2)
+    n = 15
+    # Graph ids 0, 2, 3: id 1 is empty
+    batch = torch.tensor([0] * 5 + [2] * 6 + [3] * 4)
+    data = Data(x=torch.randn(n, 8), edge_index=torch.randint(0, n, (2, 50)), batch=batch)
+    model = GNNBackbone("sage", [16, 8, 12], out_dim=3, residue_logits=residue_logits)
+    model(data)
+    model.eval()  # dropout off; gradients still enabled
+
+    out = model(data)
+    expected = _reference_readout(model, data)
+    assert out.shape == expected.shape
+    assert torch.allclose(out, expected, atol=1e-5)
+
+    grad = torch.randn_like(out)
+    (g,) = torch.autograd.grad(out, model.readout.weight, grad)
+    (g_ref,) = torch.autograd.grad(expected, model.readout.weight, grad)
+    assert torch.allclose(g, g_ref, atol=1e-5)
+
+
+def _core_inputs(model: GNNBackbone, data: Data) -> tuple:
+    x, edge_index, edge_attr, edge_weight, batch = model._prepare_inputs(data)
+    counts = None
+    if not model.residue_logits:
+        counts = torch.bincount(batch).clamp_min(1).unsqueeze(-1).to(x.dtype)
+    return x, edge_index, edge_attr, edge_weight, batch, counts
+
+
+@pytest.mark.parametrize("conv_type", ["gcn", "sage", "gine"])
+@pytest.mark.parametrize("residue_logits", [False, True])
+def test_cuda_graph_padding_preserves_outputs(conv_type, residue_logits):
+    """Bucket padding used for CUDA graph buffers leaves the real output rows unchanged."""
+    torch.manual_seed(3)
+    model = GNNBackbone(conv_type, [16, 16], out_dim=4, residue_logits=residue_logits).eval()
+    batch = torch.tensor([0] * 7 + [1] * 6)
+    big = Data(x=torch.randn(13, 8), edge_index=torch.randint(0, 13, (2, 40)),
+               edge_attr=torch.rand(40, 3), batch=batch)
+    small = Data(x=torch.randn(11, 8), edge_index=torch.randint(0, 11, (2, 33)),
+                 edge_attr=torch.rand(33, 3), batch=batch[:11])
+    model(big)
+
+    static = None
+    for data in (big, small):  # the second graph reuses the first one's buffers
+        inputs = _core_inputs(model, data)
+        rows = data.num_nodes if residue_logits else 2
+        with torch.no_grad():
+            static = model._pad_inputs(inputs, static)
+            padded = model._forward_core(*static)[:rows]
+            expected = model._forward_core(*inputs)
+        assert static[0].size(0) == 16
+        assert torch.allclose(padded, expected, atol=1e-5)
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason="CUDA required")
+@pytest.mark.parametrize("conv_type", ["gcn", "sage", "gat"])
+@pytest.mark.parametrize("residue_logits", [False, True])
+def test_cuda_graph_replay_matches_eager(conv_type, residue_logits):
+    """Replays with new inputs (same and smaller size, one bucket) match the eager forward."""
+    torch.manual_seed(4)
+    dev = torch.device("cuda")
+    model = GNNBackbone(conv_type, [16, 16], out_dim=4, residue_logits=residue_logits, use_cuda_graph=True)
+    batches = [
+        Data(x=torch.randn(n, 8), edge_index=torch.randint(0, n, (2, e)), edge_attr=torch.rand(e, 3),
+             batch=torch.arange(n) * 3 // n).to(dev)
+        for n, e in ((50, 200), (50, 200), (45, 180))
+    ]
+    model(batches[0])
+    model.eval()
+    with torch.no_grad():
+        for data in batches:
+            out = model(data)
+            model.use_cuda_graph = False
+            expected = model(data)
+            model.use_cuda_graph = True
+            assert torch.allclose(out, expected, atol=1e-5)
+    # GAT/GATv2 are never captured; the others share one graph across all three calls
+    assert len(model._cuda_graphs) == (0 if conv_type == "gat" else 1)
+
+
+@pytest.mark.parametrize("conv_type", ["gcn", "sage"])
+@pytest.mark.parametrize("dynamic", [True, False])
+def test_forward_core_traces_without_graph_breaks(conv_type, dynamic):
+    """Dynamo captures the core (incl. GCN's sparse CSR adj_t) as one graph, matching eager."""
+    import torch._dynamo as dynamo
+
+    data = _graph()
+    data.batch = torch.tensor([0] * 6 + [1] * 6)
+    model = GNNBackbone(conv_type, [16, 16], out_dim=4).eval()
+    model(data)
+    inputs = _core_inputs(model, data)
+    explained = dynamo.explain(model._forward_core)(*inputs)
+    assert explained.graph_count == 1 and explained.graph_break_count == 0
+
+    dynamo.reset()
+    compiled = torch.compile(model._forward_core, backend="aot_eager", dynamic=dynamic)
+    with torch.no_grad():
+        assert torch.allclose(compiled(*inputs), model._forward_core(*inputs), atol=1e-5)
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason="CUDA required")
+@pytest.mark.parametrize("conv_type", ["gcn", "sage"])
+@pytest.mark.parametrize("compile_dynamic", [True, False])
+def test_compile_forward_matches_eager_on_cuda(conv_type, compile_dynamic):
+    """compile_forward (Inductor, reduce-overhead) matches the eager forward on CUDA inputs."""
+    torch._dynamo.reset()
+    dev = torch.device("cuda")
+    batches = [_graph(n=n, e=4 * n) for n in (12, 12, 20)]
+    batches[1].x = torch.randn(12, 8)  # same shape, new values
+    batches = [data.to(dev) for data in batches]
+    eager = GNNBackbone(conv_type, [16, 16], out_dim=4)
+    eager(batches[0])
+    eager.eval()
+    compiled = GNNBackbone(conv_type, [16, 16], out_dim=4, compile_forward=True, compile_dynamic=compile_dynamic)
+    compiled(batches[0])
+    compiled.load_state_dict(eager.state_dict())
+    compiled.eval()
+    with torch.no_grad():
+        for data in batches:
+            assert torch.allclose(compiled(data), eager(data), atol=1e-4)
+
+
+def _first_conv_dtype(model: GNNBackbone, data: Data) -> torch.dtype:
+    seen = []
+    handle = model.convs[0].register_forward_hook(lambda m, i, o: seen.append(o.dtype))
+    try:
+        model(data)
+    finally:
+        handle.remove()
+    return seen[0]
+
+
+@pytest.mark.parametrize("conv_type", ["gcn", "gat", "gatv2", "sage", "gin", "gine"])
+def test_autocast_dtype_close_to_fp32(conv_type):
+    """autocast_dtype=bf16 runs the convs in bf16 and stays close to the FP32 forward."""
+    data = _graph()
+    data.batch = torch.tensor([0] * 6 + [1] * 6)
+    ref = GNNBackbone(conv_type, [16, 16], out_dim=4)
+    ref(data)
+    ref.eval()
+    amp = GNNBackbone(conv_type, [16, 16], out_dim=4, autocast_dtype=torch.bfloat16)
+    amp(data)
+    amp.load_state_dict(ref.state_dict())
+    amp.eval()
+    with torch.no_grad():
+        out = amp(data)
+        if conv_type in ("sage", "gin", "gine"):  # GCN's SpMM and GAT's softmax run in FP32
+            assert _first_conv_dtype(amp, data) == torch.bfloat16
+        assert out.dtype == torch.float32
+        assert torch.allclose(out, ref(data), atol=5e-2, rtol=5e-2)
+
+
+def test_outer_autocast_is_not_disabled():
+    """Without autocast_dtype, a caller's autocast context still applies to the convs."""
+    data = _graph()
+    model = GNNBackbone("sage", [16, 16], out_dim=4).eval()
+    model(data)
+    with torch.no_grad():
+        assert _first_conv_dtype(model, data) == torch.float32
+        with torch.autocast("cpu", dtype=torch.bfloat16):
+            assert _first_conv_dtype(model, data) == torch.bfloat16
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason="CUDA required")
+@pytest.mark.parametrize("conv_type", ["gcn", "sage"])
+def test_cuda_graph_keyed_on_outer_autocast(conv_type):
+    """Graphs captured with and without a caller's autocast are never replayed in the other mode."""
+    torch.manual_seed(5)
+    dev = torch.device("cuda")
+    data = Data(x=torch.randn(50, 8), edge_index=torch.randint(0, 50, (2, 200))).to(dev)
+    model = GNNBackbone(conv_type, [16, 16], out_dim=4, use_cuda_graph=True)
+    model(data)
+    model.eval()
+    with torch.no_grad():
+        for amp in (False, True, False, True):
+            with torch.autocast("cuda", dtype=torch.float16, enabled=amp):
+                out = model(data)
+                model.use_cuda_graph = False
+                expected = model(data)
+                model.use_cuda_graph = True
+            assert torch.allclose(out, expected, atol=1e-3)
+    assert len(model._cuda_graphs) == 2
+
+
+def test_gcn_adj_cache_hits_invalidates_and_evicts():
+    """adj_t is reused for the same edge tensors, rebuilt after in-place edits, dropped once freed."""
+    import gc
+
+    data = _graph()
+    model = GNNBackbone("gcn", [16], out_dim=4)
+    x, ei, ea = data.x, data.edge_index, data.edge_attr.clone()
+    adj_t = model._prep_gcn(x, ei, ea, None)[0]
+    assert model._prep_gcn(x, ei, ea, None)[0] is adj_t
+
+    ea.mul_(2.0)  # bumps the version counter
+    assert model._prep_gcn(x, ei, ea, None)[0] is not adj_t
+    assert len(model._adj_cache) == 2
+
+    del ea
+    gc.collect()
+    assert len(model._adj_cache) == 0
+
+
+def test_gcn_adj_cache_inference_then_grad():
+    """An adj_t built under inference_mode is not reused where autograd must save it."""
+    data = _graph()
+    model = GNNBackbone("gcn", [16], out_dim=4)
+    model(data)
+    with torch.inference_mode():
+        model(data)
+    model(data).sum().backward()
+
+
+def _reference_edge_weight(edge_attr: torch.Tensor, mode: str) -> torch.Tensor:
+    """Original (unfused, out-of-place) edge_attr→edge_weight formulas."""
+    eps = 1e-8
+    if edge_attr.dim() == 1:
+        w = edge_attr
+    elif edge_attr.size(-1) == 1:
+        w = edge_attr.squeeze(-1)
+    elif mode == "first_inv":
+        w = 1.0 / (edge_attr[:, 0] + eps)
+    elif mode == "mean_inv":
+        w = 1.0 / (edge_attr.mean(dim=-1) + eps)
+    else:
+        m = edge_attr.mean(dim=-1)
+        m_min, m_max = m.min(), m.max()
+        if (m_max - m_min) > eps:
+            w = 1.0 - (m - m_min) / (m_max - m_min + eps)
+        else:
+            w = torch.ones_like(m)
+    return torch.clamp(w, min=0.0)
+
+
+@pytest.mark.parametrize("mode", ["auto", "mean_inv", "first_inv"])
+@pytest.mark.parametrize("requires_grad", [False, True])
+@pytest.mark.parametrize("shape", [(40,), (40, 1), (40, 3), "constant"])
+def test_edge_weight_from_attr_matches_original_formulas(mode, requires_grad, shape):
+    """Fused/in-place conversion matches the original formulas (values and gradients)."""
+    from src.plaszyme.models.gnn.backbone import _edge_weight_from_attr
+
+    torch.manual_seed(6)
+    if shape == "constant":  # auto: zero span → all-ones weights
+        attr = torch.full((40, 3), 0.7)
+    else:
+        attr = torch.rand(*shape) * 2.0 - 0.5  # negative values exercise the clamp
+    a = attr.clone().requires_grad_(requires_grad)
+    a_ref = attr.clone().requires_grad_(requires_grad)
+
+    w = _edge_weight_from_attr(a, mode=mode)
+    w_ref = _reference_edge_weight(a_ref, mode)
+    assert torch.allclose(w, w_ref, rtol=1e-5, atol=1e-6)
+    assert torch.equal(a.detach(), attr)  # caller's edge_attr is never mutated
+
+    assert w.requires_grad == w_ref.requires_grad  # constant "auto" weights carry no graph
+    if w_ref.requires_grad:
+        r = torch.randn(40)
+        (g,) = torch.autograd.grad((w * r).sum(), a)
+        (g_ref,) = torch.autograd.grad((w_ref * r).sum(), a_ref)
+        assert torch.allclose(g, g_ref, rtol=1e-4, atol=1e-5)